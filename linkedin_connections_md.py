@@ -2,9 +2,11 @@ def main():
     parser = argparse.ArgumentParser(description="Update LinkedIn Markdown profiles from export CSV.")
     parser.add_argument('-c', '--config', dest='config_dir', default=DEFAULT_CONFIG_DIR, help='Config folder (not used yet)')
     parser.add_argument('-s', '--source', dest='people_dir', default=DEFAULT_PEOPLE_DIR, help='Source folder for person Markdown files')
-    parser.add_argument('-f', '--file', dest='csv_file', default=DEFAULT_CSV_FILE, help='Source LinkedIn CSV file')
+    parser.add_argument('-f', '--file', dest='csv_file', default=DEFAULT_CSV_FILE, help='Source LinkedIn CSV file or export ZIP archive')
     parser.add_argument('-o', '--output', dest='output_dir', default=None, help='Output folder for updated Markdown files (default: same as source)')
     parser.add_argument('-x', '--max', dest='max_people', type=int, default=None, help='Max people to update')
+    parser.add_argument('--shard', dest='shard', default=None, help='Only process shard I of N, e.g. 2/4, for splitting the sync across workers')
+    parser.add_argument('--summary', dest='summary_file', default=None, help='Write a JSON summary of the counts, to combine with linkedin_connections_merge.py')
     parser.add_argument('-d', '--debug', dest='debug', action='store_true', help='Enable debug/verbose output')
     args = parser.parse_args()
 
@@ -13,46 +15,63 @@ def main():
     output_dir = args.output_dir or people_dir
     max_people = args.max_people
     debug = args.debug
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
     # config_dir = args.config_dir  # Not used yet
 
     if not people_dir or not os.path.isdir(people_dir):
         print(f"ERROR: Source folder for People Markdown files not found: {people_dir}\nSpecify the folder containing your People Markdown files with -s or --source.")
         sys.exit(1)
 
-    updated_count = 0
-    processed_count = 0
-    not_found_count = 0
     if not os.path.isfile(csv_file):
         print(f"ERROR: CSV file not found: {csv_file}\nSpecify the correct folder with -f or --file, or provide the full path to the file.")
         sys.exit(1)
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        # Skip lines until we find the header
-        while True:
-            header = f.readline()
-            if not header:
-                print("ERROR: Could not find CSV header line starting with 'First Name'.")
-                sys.exit(1)
-            if header.strip().startswith('First Name'):
-                break
-        header = header.strip().replace('\r', '').replace('\n', '')
-        fieldnames = [h.strip() for h in header.split(',')]
-        # Read the rest of the lines as data
-        data_lines = list(f)
-        reader = csv.DictReader(data_lines, fieldnames=fieldnames)
+    if not export_contains(csv_file, CONNECTIONS_FILE):
+        print(f"ERROR: {CONNECTIONS_FILE} not found in {csv_file}\nSpecify the LinkedIn export ZIP or the extracted CSV file with -f or --file.")
+        sys.exit(1)
+    try:
+        summary = sync_connections(csv_file, people_dir, max_people, shard, debug)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"{summary.get('shard', 'all')}: processed {summary['processed']}, updated {summary['updated']}, not found {summary['not_found']}")
+    if args.summary_file:
+        save_summary(args.summary_file, summary)
+
+def sync_connections(csv_file, people_dir, max_people=None, shard=None, debug=False, find_person=None):
+    """
+    Update the Markdown profiles in people_dir from the connections CSV file or export ZIP.
+    `find_person(name, linkedin_id)` returns (slug, md_path) for a connection, by default
+    from an index of people_dir built once up front, and can be swapped for a lookup
+    that's already been done.
+    Returns a summary dict of the processed, updated and not found counts.
+    Raises ValueError if the file has no connections header.
+    """
+    if find_person is None:
+        # Index the People folder before any profile is updated. Every row,
+        # sharded or not, is then matched the same way, and shards don't
+        # re-read profiles that other shards are writing.
+        people_index = build_people_index(people_dir)
+        def find_person(name, linkedin_id):
+            return find_person_in_index(people_index, name, linkedin_id)
+    updated_count = 0
+    processed_count = 0
+    not_found_count = 0
+    with open_export_file(csv_file, CONNECTIONS_FILE) as f:
+        reader = read_connections(f)
+        if reader is None:
+            raise ValueError(f"Could not find CSV header line starting with 'First Name' in {csv_file}.")
         if debug:
-            print(f"[DEBUG] CSV fieldnames: {fieldnames}")
+            print(f"[DEBUG] CSV fieldnames: {reader.fieldnames}")
         for row in reader:
-            processed_count += 1
             if debug:
                 print(f"[DEBUG] Raw CSV row: {row}")
-            import re
-            first_name = row.get('First Name', '').strip()
-            last_name = row.get('Last Name', '').strip()
-            # Remove credentials after comma, parenthetical pronouns, or trailing uppercase credentials
-            last_name = re.sub(r',.*', '', last_name).strip()
-            last_name = re.sub(r'\(.*?\)', '', last_name).strip()
-            last_name = re.sub(r'\s+([A-Z][A-Z\.\-/ ]+)$', '', last_name).strip()
-            name = f"{first_name} {last_name}".strip()
+            name = get_connection_name(row)
             linkedin_url = row.get('URL', '').strip()
             linkedin_id = get_linkedin_id_from_url(linkedin_url)
             csv_title = row.get('Position', '').strip()
@@ -60,7 +79,14 @@ def main():
             if debug:
                 print(f"[DEBUG] Extracted: name='{name}', linkedin_url='{linkedin_url}', linkedin_id='{linkedin_id}', title='{csv_title}', org='{csv_org}'")
 
-            slug, md_path = find_person_by_name_or_id(name, linkedin_id, people_dir)
+            slug, md_path = find_person(name, linkedin_id)
+            if shard:
+                # Shard on the resolved file so no two shards ever write the
+                # same profile, rows that don't resolve go by their URL or name
+                key = shard_key(md_path, people_dir) if slug else f"not-found:{linkedin_id or name}"
+                if shard_of(key, shard[1]) != shard[0]:
+                    continue
+            processed_count += 1
             if not slug:
                 print(f"{name} {linkedin_url} not found")
                 not_found_count += 1
@@ -286,6 +312,16 @@ def main():
                 print(f"Max people processed ({max_people}), stopping.")
                 break
 
+    summary = {
+        'processed': processed_count,
+        'updated': updated_count,
+        'not_found': not_found_count,
+    }
+    if shard:
+        summary['shard'] = f"{shard[0]}/{shard[1]}"
+    return summary
+
+
 
 import os
 import csv
@@ -293,9 +329,12 @@ import glob
 import re
 import sys
 import yaml
+import shutil
 import argparse
+import tempfile
 from collections import OrderedDict
-from linkedin_connections_md_helpers import find_person_by_name_or_id, parse_positions_from_body, compare_positions
+from linkedin_export_helpers import open_export_file, export_contains
+from linkedin_connections_md_helpers import parse_positions_from_body, compare_positions, parse_shard, shard_key, shard_of, save_summary, build_people_index, find_person_in_index
 
 # Insert path to hal/person code
 sys.path.insert(1, '../hal/')
@@ -309,6 +348,7 @@ Configuration section: defines default directories and files for the LinkedIn Ma
 # Defaults (can be overridden by CLI)
 DEFAULT_PEOPLE_DIR = "people/"
 DEFAULT_CSV_FILE = "Connections.csv"
+CONNECTIONS_FILE = "Connections.csv"  # name of the file inside the export ZIP
 DEFAULT_OUTPUT_DIR = None  # If not set, use source folder
 DEFAULT_CONFIG_DIR = None
 
@@ -319,6 +359,30 @@ Helper functions for slugifying names, extracting LinkedIn IDs, and loading/savi
 def slugify(name):
     return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
 
+def get_connection_name(row):
+    first_name = row.get('First Name', '').strip()
+    last_name = row.get('Last Name', '').strip()
+    # Remove credentials after comma, parenthetical pronouns, or trailing uppercase credentials
+    last_name = re.sub(r',.*', '', last_name).strip()
+    last_name = re.sub(r'\(.*?\)', '', last_name).strip()
+    last_name = re.sub(r'\s+([A-Z][A-Z\.\-/ ]+)$', '', last_name).strip()
+    return f"{first_name} {last_name}".strip()
+
+def read_connections(f):
+    """
+    Skip the notes LinkedIn puts above the header and stream the rest of
+    the file as rows. Returns a csv.DictReader or None if there's no header.
+    """
+    while True:
+        header = f.readline()
+        if not header:
+            return None
+        if header.strip().startswith('First Name'):
+            break
+    header = header.strip().replace('\r', '').replace('\n', '')
+    fieldnames = [h.strip() for h in header.split(',')]
+    return csv.DictReader(f, fieldnames=fieldnames)
+
 def get_linkedin_id_from_url(url):
     if not url:
         return ''
@@ -348,29 +412,39 @@ def save_markdown_profile(md_path, frontmatter, body):
     print(f"[DEBUG] Writing updated profile to: {md_path}")
     """
     Preserve all original fields, including empty ones, and only update/add as needed.
+    Writes to a temporary file and swaps it in so nobody else, e.g. another
+    shard, ever reads a half written profile.
     """
     clean_frontmatter = OrderedDict(frontmatter)
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write('---\n')
-        for k, v in clean_frontmatter.items():
-            if k == 'tags' and isinstance(v, list):
-                f.write('tags:\n')
-                for tag in v:
-                    f.write(f'  - {tag}\n')
-            elif k == 'organizations' and isinstance(v, list):
-                f.write('organizations:\n')
-                for org in v:
-                    f.write(f'  - {org}\n')
-            elif v is None or v == '' or v == [] or v == {}:
-                f.write(f'{k}:\n')
-            elif isinstance(v, str) and re.match(r'^[A-Za-z0-9_\-:. ]+$', v):
-                # Write simple strings (like dates) without quotes
-                f.write(f'{k}: {v}\n')
-            else:
-                # Write other fields as YAML scalars
-                yaml.dump({k: v}, f, sort_keys=False, allow_unicode=True, default_flow_style=False)
-        f.write('---\n\n')
-        f.write(body.strip() + '\n')
+    fd, tmp_path = tempfile.mkstemp(prefix='.', suffix='.md.tmp', dir=os.path.dirname(md_path) or '.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('---\n')
+            for k, v in clean_frontmatter.items():
+                if k == 'tags' and isinstance(v, list):
+                    f.write('tags:\n')
+                    for tag in v:
+                        f.write(f'  - {tag}\n')
+                elif k == 'organizations' and isinstance(v, list):
+                    f.write('organizations:\n')
+                    for org in v:
+                        f.write(f'  - {org}\n')
+                elif v is None or v == '' or v == [] or v == {}:
+                    f.write(f'{k}:\n')
+                elif isinstance(v, str) and re.match(r'^[A-Za-z0-9_\-:. ]+$', v):
+                    # Write simple strings (like dates) without quotes
+                    f.write(f'{k}: {v}\n')
+                else:
+                    # Write other fields as YAML scalars
+                    yaml.dump({k: v}, f, sort_keys=False, allow_unicode=True, default_flow_style=False)
+            f.write('---\n\n')
+            f.write(body.strip() + '\n')
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    if os.path.exists(md_path):
+        shutil.copymode(md_path, tmp_path)
+    os.replace(tmp_path, md_path)
 
 
 
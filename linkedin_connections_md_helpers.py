@@ -1,37 +1,166 @@
 import os
 import re
 import glob
+import json
+import hashlib
 from difflib import SequenceMatcher
 
+SUMMARY_COUNTS = ['processed', 'updated', 'not_found']
+
+def parse_shard(spec):
+    """
+    Parse a shard spec like `2/4` into (2, 4).
+    Shards are numbered from 1 to N. Raises ValueError if the spec is invalid.
+    """
+    m = re.match(r'^\s*(\d+)\s*/\s*(\d+)\s*$', spec or '')
+    if not m:
+        raise ValueError(f"invalid shard '{spec}', expected I/N e.g. 1/4")
+    index, count = int(m.group(1)), int(m.group(2))
+    if count < 1 or index < 1 or index > count:
+        raise ValueError(f"invalid shard '{spec}', I must be between 1 and N")
+    return index, count
+
+def shard_key(md_path, people_dir):
+    """
+    The key a profile is sharded on: its path relative to the people folder,
+    so workers that mount the vault in different places still agree.
+    """
+    return os.path.relpath(md_path, people_dir).replace(os.sep, '/')
+
+def shard_of(key, shard_count):
+    """
+    Map a key to a shard from 1 to `shard_count` using a stable hash, the
+    built-in hash() is salted per process so can't be used across workers.
+    """
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count + 1
+
+def save_summary(path, summary):
+    """
+    Write a shard summary of the processed, updated and not found counts as JSON.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+        f.write('\n')
+
+def summary_problem(summary):
+    """
+    Check a summary read back from JSON.
+    Returns a description of what's wrong with it, or None if it's fine.
+    """
+    if not isinstance(summary, dict):
+        return "is not a summary"
+    for name in SUMMARY_COUNTS:
+        value = summary.get(name)
+        # bool is an int in Python but never a valid count
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            return f"has a bad '{name}' count: {value!r}"
+    if summary.get('shard'):
+        try:
+            parse_shard(summary['shard'])
+        except (TypeError, ValueError) as e:
+            return str(e)
+    return None
+
+def merge_summaries(summaries, labels=None):
+    """
+    Combine shard summaries into one, `labels` (e.g. the file names) are used
+    to say which summary a problem is in.
+    Returns (merged, problems) where problems lists any bad summaries, which
+    are left out, missing or repeated shards, or summaries from unsharded runs
+    which would be counted twice.
+    """
+    merged = {name: 0 for name in SUMMARY_COUNTS}
+    problems = []
+    seen = {}
+    shard_counts = set()
+    unsharded = 0
+    for number, summary in enumerate(summaries):
+        problem = summary_problem(summary)
+        if problem:
+            label = labels[number] if labels else f"summary {number + 1}"
+            problems.append(f"{label} {problem}, left out")
+            continue
+        for name in SUMMARY_COUNTS:
+            merged[name] += summary[name]
+        shard = summary.get('shard')
+        if not shard:
+            unsharded += 1
+            continue
+        index, count = parse_shard(shard)
+        shard_counts.add(count)
+        seen[index] = seen.get(index, 0) + 1
+    if len(shard_counts) > 1:
+        problems.append(f"shard reports disagree on N: {sorted(shard_counts)}")
+    elif shard_counts:
+        count = shard_counts.pop()
+        for index in range(1, count + 1):
+            if index not in seen:
+                problems.append(f"shard {index}/{count} missing")
+            elif seen[index] > 1:
+                problems.append(f"shard {index}/{count} reported {seen[index]} times")
+    if unsharded and len(summaries) > 1:
+        problems.append(f"{unsharded} summaries are not from a --shard run, they cover all rows")
+    return merged, problems
+
 def find_person_by_name_or_id(name, linkedin_id, people_dir):
     """
     Fuzzy match a person by name or linkedin_id in the people_dir.
     Returns (slug, md_path) or (None, None) if not found.
+    To look up many people, build the index once and use find_person_in_index.
     """
-    # Try by linkedin_id first
+    return find_person_in_index(build_people_index(people_dir), name, linkedin_id)
+
+def build_people_index(people_dir):
+    """
+    Walk the people_dir once and index every profile so many people can be
+    looked up without walking the folder again for each one.
+    Returns a dict with `by_linkedin_id` mapping linkedin_id to (slug, md_path),
+    `by_slug` mapping a person's slug (their folder) to their profile, i.e. the
+    only file with a linkedin_id in folders with that name, and `by_name`, a
+    list of (name, slug, md_path) for fuzzy name matching.
+    """
+    index = {'by_linkedin_id': {}, 'by_slug': {}, 'by_name': []}
+    slug_profiles = {}  # slug -> every profile with a linkedin_id in a folder with that name
     for root, dirs, files in os.walk(people_dir):
         for file in files:
             if file.endswith('.md'):
                 md_path = os.path.join(root, file)
+                slug = os.path.basename(root)
                 with open(md_path, 'r', encoding='utf-8') as f:
                     content = f.read()
-                    if f"linkedin_id: {linkedin_id}" in content:
-                        slug = os.path.basename(root)
-                        return slug, md_path
-    # Fuzzy match by name
+                linkedin_ids = re.findall(r'^linkedin_id:[ \t]*(\S+)', content, re.MULTILINE)
+                for linkedin_id in linkedin_ids:
+                    # first profile found wins
+                    index['by_linkedin_id'].setdefault(linkedin_id.strip('"\''), (slug, md_path))
+                if linkedin_ids:
+                    slug_profiles.setdefault(slug, []).append(md_path)
+                index['by_name'].append((os.path.splitext(file)[0].lower(), slug, md_path))
+    # leave out slugs that could be more than one profile
+    for slug, md_paths in slug_profiles.items():
+        if len(md_paths) == 1:
+            index['by_slug'][slug] = md_paths[0]
+    return index
+
+def find_person_in_index(index, name, linkedin_id):
+    """
+    Find a person in an index from build_people_index, first by an exact
+    match on linkedin_id and then by fuzzy matching the name.
+    Returns (slug, md_path) or (None, None) if not found.
+    """
+    if linkedin_id and linkedin_id in index['by_linkedin_id']:
+        return index['by_linkedin_id'][linkedin_id]
+    if not name:
+        return None, None
     best_score = 0.0
     best_slug = None
     best_md_path = None
-    for root, dirs, files in os.walk(people_dir):
-        for file in files:
-            if file.endswith('.md'):
-                slug = os.path.basename(root)
-                candidate_name = os.path.splitext(file)[0]
-                score = SequenceMatcher(None, candidate_name.lower(), name.lower()).ratio()
-                if score > best_score:
-                    best_score = score
-                    best_slug = slug
-                    best_md_path = os.path.join(root, file)
+    for candidate_name, slug, md_path in index['by_name']:
+        score = SequenceMatcher(None, candidate_name, name.lower()).ratio()
+        if score > best_score:
+            best_score = score
+            best_slug = slug
+            best_md_path = md_path
     if best_score > 0.85:
         return best_slug, best_md_path
     return None, None
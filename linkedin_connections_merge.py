@@ -0,0 +1,41 @@
+import sys
+import json
+import argparse
+from linkedin_connections_md_helpers import merge_summaries, save_summary
+
+"""
+Combine the JSON summaries written by `linkedin_connections_md.py --shard I/N --summary FILE`
+into one set of processed, updated and not found counts.
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge shard summaries from linkedin_connections_md.py.")
+    parser.add_argument('summary_files', nargs='+', help='Shard summary JSON files')
+    parser.add_argument('-o', '--output', dest='output_file', default=None, help='Write the merged summary to this JSON file')
+    args = parser.parse_args()
+
+    summaries = []
+    for summary_file in args.summary_files:
+        try:
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                summaries.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Could not read shard summary {summary_file}: {e}")
+            sys.exit(1)
+
+    try:
+        merged, problems = merge_summaries(summaries, args.summary_files)
+    except (TypeError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    for problem in problems:
+        print(f"WARNING: {problem}")
+    print(f"processed {merged['processed']}, updated {merged['updated']}, not found {merged['not_found']}")
+    if args.output_file:
+        save_summary(args.output_file, merged)
+    if problems:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
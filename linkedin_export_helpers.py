@@ -0,0 +1,44 @@
+import io
+import os
+import zipfile
+from contextlib import contextmanager
+
+@contextmanager
+def open_export_file(path, member_name):
+    """
+    Open a file from a LinkedIn export for reading as text.
+    `path` is either the CSV file itself or the export ZIP archive, in which
+    case `member_name` (e.g. `messages.csv`) is streamed straight out of the
+    archive without extracting it to disk.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            member = find_export_member(archive, member_name)
+            if member is None:
+                raise FileNotFoundError(f"{member_name} not found in {path}")
+            with archive.open(member) as raw:
+                yield io.TextIOWrapper(raw, encoding='utf-8')
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield f
+
+def export_contains(path, member_name):
+    """
+    True if `path` is a plain file, or an export ZIP archive with `member_name` in it.
+    """
+    if not zipfile.is_zipfile(path):
+        return os.path.isfile(path)
+    with zipfile.ZipFile(path) as archive:
+        return find_export_member(archive, member_name) is not None
+
+def find_export_member(archive, member_name):
+    """
+    Find `member_name` in the archive, ignoring case and any sub-folder.
+    Returns the ZipInfo or None if not found.
+    """
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        if os.path.basename(info.filename).lower() == member_name.lower():
+            return info
+    return None
@@ -0,0 +1,166 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(1, '../hal/')
+sys.path.insert(1, '../message_md/')
+import message_md
+import config
+import markdown
+
+import linkedin_md
+from linkedin_connections_md import sync_connections, read_connections, get_connection_name, get_linkedin_id_from_url, CONNECTIONS_FILE
+from linkedin_connections_md_helpers import build_people_index, find_person_in_index
+from linkedin_export_helpers import open_export_file, export_contains
+
+"""
+Process a whole LinkedIn export in one run: update the People Markdown
+profiles from `Connections.csv` and convert `messages.csv` to Markdown.
+
+Every LinkedIn profile in either file is resolved once up front into a
+single map of linkedin_id -> (slug, md_path, Person) and both steps read
+from it.
+
+Each CSV is streamed twice, once to collect the LinkedIn IDs and once to
+process it. That costs a second decompress and parse of each file but
+keeps memory flat, rather than holding every row in between.
+"""
+
+DEFAULT_PEOPLE_DIR = "people/"
+
+def find_export_file(export_path, member_name):
+    """
+    Returns the path to read `member_name` from, the export ZIP itself or the
+    file in the extracted export folder, or None if it's not in the export.
+    """
+    path = export_path
+    if os.path.isdir(export_path):
+        path = os.path.join(export_path, member_name)
+    if os.path.isfile(path) and export_contains(path, member_name):
+        return path
+    return None
+
+def load_connection_profiles(connections_path, profiles):
+    """
+    Add the LinkedIn ID and name of each connection to `profiles`.
+    Raises ValueError if the file has no connections header.
+    """
+    with open_export_file(connections_path, CONNECTIONS_FILE) as f:
+        reader = read_connections(f)
+        if reader is None:
+            raise ValueError(f"Could not find CSV header line starting with 'First Name' in {connections_path}.")
+        for row in reader:
+            linkedin_id = get_linkedin_id_from_url(row.get('URL', '').strip())
+            if linkedin_id:
+                profiles[linkedin_id] = get_connection_name(row)
+
+def resolve_people(connection_profiles, message_ids, people_index, the_config):
+    """
+    Resolve every LinkedIn ID in the export once.
+    Returns a dict mapping linkedin_id to (slug, md_path, Person). The Person
+    from the message_md config is only looked up for IDs in the messages, and
+    the profile is only looked up for connections. Profiles are matched the
+    same way as linkedin_connections_md.py, exact linkedin_id first, then by
+    the Person's slug (their folder in the People folder), then by name.
+    """
+    resolved = {}
+    for linkedin_id in set(connection_profiles) | message_ids:
+        slug, md_path, person = None, None, None
+        if linkedin_id in message_ids:
+            person = the_config.get_person_by_linkedin_id(linkedin_id)
+        if linkedin_id in connection_profiles:
+            if linkedin_id in people_index['by_linkedin_id']:
+                slug, md_path = people_index['by_linkedin_id'][linkedin_id]
+            elif person and person.slug in people_index['by_slug']:
+                slug, md_path = person.slug, people_index['by_slug'][person.slug]
+            else:
+                slug, md_path = find_person_in_index(people_index, connection_profiles[linkedin_id], linkedin_id)
+        resolved[linkedin_id] = (slug, md_path, person)
+    return resolved
+
+def main():
+    # no abbreviations so a message_md option like --exp isn't taken for
+    # --export, and -h is left for message_md too
+    parser = argparse.ArgumentParser(description="Process a whole LinkedIn export, connections and messages, in one run.", add_help=False, allow_abbrev=False)
+    parser.add_argument('--export', dest='export_path', default=None, help='LinkedIn export ZIP archive or extracted export folder (required)')
+    parser.add_argument('--people', dest='people_dir', default=DEFAULT_PEOPLE_DIR, help='Folder with the person Markdown files to update')
+    args, message_md_args = parser.parse_known_args()
+
+    # the rest of the command line is for message_md
+    sys.argv = [sys.argv[0]] + message_md_args
+
+    if '-h' in message_md_args or '--help' in message_md_args:
+        # show these options and then message_md's, which exits
+        parser.print_help()
+        print()
+        message_md.setup(config.Config(), markdown.YAML_SERVICE_LINKEDIN)
+        sys.exit(0)
+
+    if not args.export_path:
+        parser.error("the following arguments are required: --export")
+
+    export_path = args.export_path
+    people_dir = args.people_dir
+
+    connections_path = find_export_file(export_path, CONNECTIONS_FILE)
+    messages_path = find_export_file(export_path, linkedin_md.LI_MESSAGES_FILE)
+    if not connections_path and not messages_path:
+        print(f"ERROR: Neither {CONNECTIONS_FILE} nor {linkedin_md.LI_MESSAGES_FILE} found in {export_path}")
+        sys.exit(1)
+
+    if connections_path and (not people_dir or not os.path.isdir(people_dir)):
+        print(f"ERROR: Source folder for People Markdown files not found: {people_dir}\nSpecify the folder containing your People Markdown files with --people.")
+        sys.exit(1)
+
+    # message_md is only needed to convert the messages
+    the_config = None
+    if messages_path:
+        the_config = config.Config()
+        if not message_md.setup(the_config, markdown.YAML_SERVICE_LINKEDIN):
+            sys.exit(1)
+
+    # first pass: collect the LinkedIn IDs
+    connection_profiles = {}  # linkedin_id -> name, for fuzzy matching by name
+    message_ids = set()
+    try:
+        if connections_path:
+            load_connection_profiles(connections_path, connection_profiles)
+        if messages_path:
+            linkedin_md.load_profile_ids(messages_path, message_ids)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    message_ids.discard('')
+
+    people_index = build_people_index(people_dir) if connections_path else None
+    resolved = resolve_people(connection_profiles, message_ids, people_index, the_config)
+
+    # second pass: process each file using the shared result
+    if connections_path:
+        def find_person(name, linkedin_id):
+            if linkedin_id in resolved:
+                return resolved[linkedin_id][:2]
+            # no LinkedIn ID in the row, still no need to walk the People folder again
+            return find_person_in_index(people_index, name, linkedin_id)
+
+        try:
+            summary = sync_connections(connections_path, people_dir, find_person=find_person)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        print(f"connections: processed {summary['processed']}, updated {summary['updated']}, not found {summary['not_found']}")
+
+    if messages_path:
+        for linkedin_id in message_ids:
+            linkedin_md.Resolved_People[linkedin_id] = resolved[linkedin_id][2]
+
+        def load_messages(filename, messages, reactions, config):
+            # read from the export rather than the file set up in message_md
+            return linkedin_md.load_messages(messages_path, messages, reactions, config)
+
+        the_messages = []
+        the_reactions = [] # required by `message_md` but not used for LinkedIn
+        message_md.get_markdown(the_config, load_messages, the_messages, the_reactions)
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ import message_md
 import config
 import markdown
 import message
+from linkedin_export_helpers import open_export_file
 
 """
 Parser for LinkedIn `messages.csv` file.
@@ -34,6 +35,8 @@ LI_FOLDER = "FOLDER"
 
 LI_PROFILE_URL = "https://www.linkedin.com/in/"
 
+LI_MESSAGES_FILE = "messages.csv" # name of the file inside the export ZIP
+
 LinkedIn_Fields = [ 
     LI_CONVERSATION_ID, LI_CONVERSATION_TITLE, LI_FROM, 
     LI_SENDER_PROFILE_URL, LI_TO, LI_RECIPIENT_PROFILE_URLS, 
@@ -42,6 +45,8 @@ LinkedIn_Fields = [
 
 Profiles_Not_Found = [] # holder for profiles we couldn't find
 
+Resolved_People = {} # LinkedIn ID -> Person, so each profile is only looked up once
+
 def parse_header(row, field_map):
 
     global LinkedIn_Fields
@@ -64,6 +69,72 @@ def field_index(field_label, field_map):
 
     return result
 
+def get_person(linkedin_id, config):
+    """
+    Get the person with a LinkedIn ID, looking them up only the first time.
+
+    Parameters:
+    linkedin_id (str): The LinkedIn ID from the profile URL.
+    config (Config): The configuration object containing person data.
+
+    Returns:
+    Person: The person or None if not found.
+    """
+
+    if linkedin_id not in Resolved_People:
+        Resolved_People[linkedin_id] = config.get_person_by_linkedin_id(linkedin_id)
+
+    return Resolved_People[linkedin_id]
+
+def get_profile_ids(row, field_map):
+    """
+    Get the LinkedIn IDs of the sender and recipient of a message, the same
+    ones that `parse_people` looks up.
+
+    Parameters:
+    row (list): The row data from the CSV file.
+    field_map (list): The mapping of columns to their field names.
+
+    Returns:
+    list: The LinkedIn IDs, sender first.
+    """
+
+    index = field_index(LI_SENDER_PROFILE_URL, field_map)
+    from_profile = row[index][len(LI_PROFILE_URL):]
+
+    # only the first recipient, same as `parse_people`
+    index = field_index(LI_RECIPIENT_PROFILE_URLS, field_map)
+    to_profile = row[index][len(LI_PROFILE_URL):].split(';')[0]
+
+    return [from_profile, to_profile]
+
+def load_profile_ids(filename, profile_ids):
+    """
+    Load the LinkedIn IDs of everyone in a LinkedIn messages CSV file.
+
+    Parameters:
+    filename (str): The path to the CSV file or export ZIP archive.
+    profile_ids (set): The set to add the LinkedIn IDs to.
+
+    Returns:
+    int: The number of rows read.
+    """
+
+    field_map = []
+
+    with open_export_file(filename, LI_MESSAGES_FILE) as csv_file:
+        reader = csv.reader(csv_file)
+
+        count = 0
+        for row in reader:
+            if count == 0:
+                parse_header(row, field_map)
+            else:
+                profile_ids.update(get_profile_ids(row, field_map))
+            count += 1
+
+    return count
+
 def parse_people(row, message, field_map, config):
     """
     Parse the sender and recipient from a row into a Message.
@@ -83,7 +154,7 @@ def parse_people(row, message, field_map, config):
     index = field_index(LI_SENDER_PROFILE_URL, field_map)
     from_profile = row[index][len(LI_PROFILE_URL):]
 
-    from_person = config.get_person_by_linkedin_id(from_profile)
+    from_person = get_person(from_profile, config)
 
     if from_person and len(from_person.slug):
         message.from_slug = from_person.slug
@@ -93,7 +164,7 @@ def parse_people(row, message, field_map, config):
         index = field_index(LI_RECIPIENT_PROFILE_URLS, field_map)
         to_profile = row[index][len(LI_PROFILE_URL):].split(';')[0]
 
-        to_person = config.get_person_by_linkedin_id(to_profile)
+        to_person = get_person(to_profile, config)
 
         if to_person and len(to_person.slug):
             message.to_slugs.append(to_person.slug)
@@ -173,8 +244,11 @@ def load_messages(filename, messages, reactions, config):
     """
     Load messages from a LinkedIn CSV file.
 
+    The file can also be the LinkedIn export ZIP archive, in which case
+    `messages.csv` is streamed out of it row by row without extracting it.
+
     Parameters:
-    filename (str): The path to the CSV file.
+    filename (str): The path to the CSV file or export ZIP archive.
     messages (list): The list to populate with Message objects.
     reactions (list): Not used for LinkedIn, but required by message_md.
     config (Config): The configuration object containing person data.
@@ -185,7 +259,7 @@ def load_messages(filename, messages, reactions, config):
 
     field_map = []
 
-    with open(filename, 'r', encoding='utf-8') as csv_file:
+    with open_export_file(filename, LI_MESSAGES_FILE) as csv_file:
         reader = csv.reader(csv_file)
 
         count = 0
@@ -202,13 +276,15 @@ def load_messages(filename, messages, reactions, config):
 
 # main
 
-the_messages = []
-the_reactions = [] # required by `message_md` but not used for LinkedIn
+if __name__ == "__main__":
+
+    the_messages = []
+    the_reactions = [] # required by `message_md` but not used for LinkedIn
 
-the_config = config.Config()
+    the_config = config.Config()
 
-if message_md.setup(the_config, markdown.YAML_SERVICE_LINKEDIN):
+    if message_md.setup(the_config, markdown.YAML_SERVICE_LINKEDIN):
 
-    # needs to be after setup so the command line parameters override the
-    # values defined in the settings file
-    message_md.get_markdown(the_config, load_messages, the_messages, the_reactions)
\ No newline at end of file
+        # needs to be after setup so the command line parameters override the
+        # values defined in the settings file
+        message_md.get_markdown(the_config, load_messages, the_messages, the_reactions)
\ No newline at end of file